@@ -6,20 +6,35 @@ This script merges the content and git history of multiple source repositories
 into a single target repository, preserving all commits and history.
 """
 
-import argparse
 import os
-import shutil
+import re
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Config overrides for every git call: keep git from starting auto gc or
+# maintenance and from querying fsmonitor / the untracked cache while we run
+# many short-lived commands in a row
+GIT_CONFIG_OVERRIDES = [
+    "-c", "gc.auto=0",
+    "-c", "maintenance.auto=false",
+    "-c", "core.fsmonitor=false",
+    "-c", "core.untrackedCache=false",
+]
+
+# `git merge-tree --write-tree` (merging without a working tree) needs git 2.38
+MERGE_TREE_MIN_VERSION = (2, 38)
+
+# Unmerged entries in `git status --porcelain` output
+CONFLICT_STATUS_RE = re.compile(rb"^(?:UU|AA|DD)", re.MULTILINE)
 
 
 class RepoMerger:
     """Handles merging of multiple git repositories into one."""
 
-    def __init__(self, target_repo: str, source_repos: List[str], verbose: bool = False):
+    def __init__(self, target_repo: str, source_repos: List[str], verbose: bool = False,
+                 cache_first: bool = False):
         """
         Initialize the RepoMerger.
 
@@ -27,34 +42,133 @@ class RepoMerger:
             target_repo: Path to the target repository (can be new or existing)
             source_repos: List of paths to source repositories to merge
             verbose: Enable verbose output
+            cache_first: Skip fetching sources whose branches haven't moved since
+                the last fetch into the target
         """
-        self.target_repo = Path(target_repo).resolve()
-        self.source_repos = [Path(repo).resolve() for repo in source_repos]
+        self.target_repo = self._absolute_path(target_repo)
+        self.source_repos = [self._absolute_path(repo) for repo in source_repos]
         self.verbose = verbose
+        self.cache_first = cache_first
+        self._cmd_cache: Dict[Tuple[Tuple[str, ...], Optional[Path], bool], subprocess.CompletedProcess] = {}
+        self._cat_file_proc: Optional[subprocess.Popen] = None
+
+    @staticmethod
+    def _absolute_path(path: str) -> Path:
+        """
+        Make a path absolute without resolving every component.
+
+        os.path.abspath is purely lexical; resolve() is only used when the path
+        itself is a symlink, so e.g. the remote name comes from the real directory.
+        """
+        abs_path = os.path.abspath(path)
+        if os.path.islink(abs_path):
+            return Path(abs_path).resolve()
+        return Path(abs_path)
+
+    def _run_command(self, cmd: List[str], cwd: Optional[Path] = None, check: bool = True,
+                     cacheable: bool = False, capture: bool = True,
+                     text: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run a shell command and handle errors.
+
+        Args:
+            cmd: Command and arguments to run
+            cwd: Working directory for the command
+            check: Raise CalledProcessError if the command fails
+            cacheable: Reuse the result of an earlier identical call (only for
+                read-only queries whose answer is stable during a run)
+            capture: Capture stdout; pass False when only the exit status is
+                used (stdout is discarded, stderr is still kept for errors)
+            text: Decode output as text; pass False to get raw bytes
+        """
+        cache_key = (tuple(cmd), cwd, text)
+        if cacheable and cache_key in self._cmd_cache:
+            result = self._cmd_cache[cache_key]
+            if check and result.returncode != 0:
+                raise subprocess.CalledProcessError(result.returncode, cmd)
+            return result
 
-    def _run_command(self, cmd: List[str], cwd: Optional[Path] = None, check: bool = True) -> subprocess.CompletedProcess:
-        """Run a shell command and handle errors."""
         if self.verbose:
             print(f"Running: {' '.join(cmd)}")
             if cwd:
                 print(f"  in: {cwd}")
 
+        run_cmd = cmd
+        env = None
+        if cmd and cmd[0] == "git":
+            run_cmd = [cmd[0], *GIT_CONFIG_OVERRIDES, *cmd[1:]]
+            # Skip optional lock taking (e.g. index refresh in git status)
+            env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+
         result = subprocess.run(
-            cmd,
+            run_cmd,
             cwd=cwd,
-            capture_output=True,
-            text=True,
+            env=env,
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=text,
             check=False
         )
 
         if check and result.returncode != 0:
             print(f"Error running command: {' '.join(cmd)}")
-            print(f"stdout: {result.stdout}")
+            if capture:
+                print(f"stdout: {result.stdout}")
             print(f"stderr: {result.stderr}")
             raise subprocess.CalledProcessError(result.returncode, cmd)
 
+        if cacheable:
+            self._cmd_cache[cache_key] = result
+
         return result
 
+    def _resolve_object(self, name: str) -> Optional[str]:
+        """
+        Resolve a ref or object name in the target repository to an object id.
+
+        Queries go through one long-lived `git cat-file --batch-check` process
+        instead of a `git rev-parse` per lookup.
+
+        Args:
+            name: Ref or object name (e.g. "refs/heads/main")
+
+        Returns:
+            The object id, or None if the name doesn't resolve
+        """
+        if self._cat_file_proc is None:
+            cmd = ["git", "cat-file", "--batch-check"]
+            if self.verbose:
+                print(f"Running: {' '.join(cmd)}")
+                print(f"  in: {self.target_repo}")
+            self._cat_file_proc = subprocess.Popen(
+                [cmd[0], *GIT_CONFIG_OVERRIDES, *cmd[1:]],
+                cwd=self.target_repo,
+                env=dict(os.environ, GIT_OPTIONAL_LOCKS="0"),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True
+            )
+
+        self._cat_file_proc.stdin.write(name + "\n")
+        self._cat_file_proc.stdin.flush()
+        line = self._cat_file_proc.stdout.readline().rstrip("\n")
+        # Output is "<oid> <type> <size>", or "<name> missing" / "<name> ambiguous"
+        if not line or line.endswith((" missing", " ambiguous")):
+            return None
+        return line.split(" ", 1)[0]
+
+    def _object_exists(self, name: str) -> bool:
+        """Check whether a ref or object name exists in the target repository."""
+        return self._resolve_object(name) is not None
+
+    def close(self):
+        """Stop the background `git cat-file` process, if one was started."""
+        if self._cat_file_proc is not None:
+            self._cat_file_proc.stdin.close()
+            self._cat_file_proc.wait()
+            self._cat_file_proc.stdout.close()
+            self._cat_file_proc = None
+
     def _validate_repos(self):
         """Validate that all source repositories exist and are git repositories."""
         for repo in self.source_repos:
@@ -68,101 +182,376 @@ class RepoMerger:
         if not self.target_repo.exists():
             print(f"Creating target repository: {self.target_repo}")
             self.target_repo.mkdir(parents=True, exist_ok=True)
-            self._run_command(["git", "init"], cwd=self.target_repo)
-            self._run_command(["git", "config", "user.email", "merge@example.com"], cwd=self.target_repo)
-            self._run_command(["git", "config", "user.name", "Repo Merger"], cwd=self.target_repo)
+            self._run_command(["git", "init"], cwd=self.target_repo, capture=False)
+            # Set the committer identity with one write instead of two `git config` calls
+            with open(self.target_repo / ".git" / "config", "a") as f:
+                f.write(
+                    "[user]\n"
+                    f"\temail = {self._quote_config_value('merge@example.com')}\n"
+                    f"\tname = {self._quote_config_value('Repo Merger')}\n"
+                )
         elif not (self.target_repo / ".git").exists():
             raise ValueError(f"Target path exists but is not a git repository: {self.target_repo}")
 
-    def _merge_repo(self, source_repo: Path, strategy: str = "ours", custom_strategy: Optional[str] = None):
+    @staticmethod
+    def _quote_config_value(value: str) -> str:
+        """Quote a string for use in a .git/config value or subsection name."""
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    def _bulk_add_remotes(self, remote_map: Dict[str, Path]):
         """
-        Merge a single repository into the target.
+        Add several remotes with a single write to .git/config.
+
+        Remotes that are already configured are left untouched, matching
+        `git remote add` failing for an existing remote.
 
         Args:
-            source_repo: Path to source repository
-            strategy: Conflict resolution strategy (built-in or custom)
-            custom_strategy: Custom git merge strategy option (e.g., 'ours', 'theirs', 'patience')
-        
-        Merge Context:
-            - "ours" refers to the current state in the target repository (HEAD)
-            - "theirs" refers to the incoming changes from the source repository
-            - When merging multiple repos sequentially, each merge builds on the previous
-              (e.g., repo1 merges into target, then repo2 merges into target+repo1, etc.)
+            remote_map: Mapping of remote name to repository path
         """
-        repo_name = source_repo.name
-        print(f"\nMerging repository: {source_repo.name}")
+        config_path = self.target_repo / ".git" / "config"
+        if not config_path.is_file():
+            # .git is a gitfile (e.g. a worktree); let git find the config
+            for remote_name, repo_path in remote_map.items():
+                self._run_command(
+                    ["git", "remote", "add", remote_name, str(repo_path)],
+                    cwd=self.target_repo,
+                    check=False,  # Don't fail if remote already exists
+                    capture=False
+                )
+            return
+
+        existing = config_path.read_text()
+        blocks = []
+        for remote_name, repo_path in remote_map.items():
+            header = f"[remote {self._quote_config_value(remote_name)}]"
+            if header in existing:
+                continue
+            blocks.append(
+                f"{header}\n"
+                f"\turl = {self._quote_config_value(str(repo_path))}\n"
+                f"\tfetch = {self._quote_config_value(f'+refs/heads/*:refs/remotes/{remote_name}/*')}\n"
+            )
 
-        # Add the source repository as a remote
-        remote_name = f"source_{repo_name}"
-        self._run_command(
-            ["git", "remote", "add", remote_name, str(source_repo)],
-            cwd=self.target_repo,
-            check=False  # Don't fail if remote already exists
-        )
+        if blocks:
+            separator = "" if not existing or existing.endswith("\n") else "\n"
+            with open(config_path, "a") as f:
+                f.write(separator + "".join(blocks))
 
-        # Fetch the source repository
-        print(f"  Fetching from {source_repo.name}...")
-        self._run_command(
-            ["git", "fetch", remote_name],
-            cwd=self.target_repo
-        )
+    def _add_all_remotes(self) -> Dict[Path, str]:
+        """
+        Add every source repository as a remote of the target (without fetching).
+
+        Returns:
+            Mapping of source repository path to its remote name
+        """
+        remotes = {}
+        remote_map = {}
+        for source_repo in self.source_repos:
+            remote_name = f"source_{source_repo.name}"
+            remotes[source_repo] = remote_name
+            remote_map.setdefault(remote_name, source_repo)
+        self._bulk_add_remotes(remote_map)
+        return remotes
+
+    def _read_symbolic_ref(self, remote_name: str) -> Optional[str]:
+        """
+        Read a remote's default branch directly from .git/refs/remotes/<remote>/HEAD.
+
+        Args:
+            remote_name: Name of the remote
+
+        Returns:
+            The branch HEAD points to, or None if it can't be read without git
+        """
+        head_file = self.target_repo / ".git" / "refs" / "remotes" / remote_name / "HEAD"
+        try:
+            head = head_file.read_text()
+        except OSError:
+            return None
+
+        prefix = f"ref: refs/remotes/{remote_name}/"
+        if not head.startswith(prefix):
+            return None
+        return head[len(prefix):].strip()
+
+    def _scan_remote_branches(self, remote_name: str) -> Optional[str]:
+        """
+        Look for a main/master branch among the remote's loose refs.
+
+        Args:
+            remote_name: Name of the remote
+
+        Returns:
+            "main" or "master" if found, otherwise None
+        """
+        try:
+            with os.scandir(self.target_repo / ".git" / "refs" / "remotes" / remote_name) as it:
+                names = {entry.name for entry in it if entry.is_file()}
+        except OSError:
+            return None
+
+        for branch in ("main", "master"):
+            if branch in names:
+                return branch
+        return None
+
+    def _resolve_default_branches(self, remote_names: List[str]) -> Dict[str, str]:
+        """
+        Resolve the default branch of each fetched remote.
+
+        Reads the refs straight from .git where possible; remotes that can't be
+        resolved that way are resolved with a single git call.
+
+        Args:
+            remote_names: Names of the remotes to resolve
+
+        Returns:
+            Mapping of remote name to its default branch
+        """
+        default_branches = {}
+        unresolved = []
+        for remote_name in remote_names:
+            branch = self._read_symbolic_ref(remote_name) or self._scan_remote_branches(remote_name)
+            if branch:
+                default_branches[remote_name] = branch
+            else:
+                unresolved.append(remote_name)
+
+        if not unresolved:
+            return default_branches
 
-        # Get the default branch of the source repo
         result = self._run_command(
-            ["git", "symbolic-ref", "refs/remotes/" + remote_name + "/HEAD"],
-            cwd=self.target_repo,
-            check=False
+            ["git", "for-each-ref", "--format=%(refname) %(symref)", "refs/remotes/"],
+            cwd=self.target_repo
         )
 
-        if result.returncode == 0:
-            default_branch = result.stdout.strip().split("/")[-1]
-        else:
+        heads = {}
+        branches = {name: [] for name in unresolved}
+        for line in result.stdout.splitlines():
+            refname, _, symref = line.partition(" ")
+            remote_name, _, branch = refname[len("refs/remotes/"):].partition("/")
+            if remote_name not in branches:
+                continue
+            if branch == "HEAD":
+                if symref:
+                    heads[remote_name] = symref[len(f"refs/remotes/{remote_name}/"):]
+            else:
+                branches[remote_name].append(branch)
+
+        for remote_name in unresolved:
+            remote_branches = branches[remote_name]
+            if remote_name in heads:
+                default_branches[remote_name] = heads[remote_name]
             # Fallback to main/master
-            result = self._run_command(
-                ["git", "branch", "-r"],
-                cwd=self.target_repo
-            )
-            branches = result.stdout.strip().split("\n")
-            if any("main" in b for b in branches):
-                default_branch = "main"
-            elif any("master" in b for b in branches):
-                default_branch = "master"
+            elif "main" in remote_branches:
+                default_branches[remote_name] = "main"
+            elif "master" in remote_branches:
+                default_branches[remote_name] = "master"
             else:
                 # Use the first branch found
-                default_branch = branches[0].strip().split("/")[-1] if branches else "master"
+                default_branches[remote_name] = remote_branches[0] if remote_branches else "master"
+        return default_branches
 
-        print(f"  Using branch: {default_branch}")
-
-        # Create a temporary branch for merging
-        merge_branch = f"merge_{repo_name}"
+    def _remote_is_current(self, source_repo: Path, remote_name: str) -> bool:
+        """
+        Check whether the remote-tracking refs already match the source's branches.
 
-        # Check out the remote branch to a local branch
-        self._run_command(
-            ["git", "checkout", "-b", merge_branch, f"{remote_name}/{default_branch}"],
-            cwd=self.target_repo,
-            check=False
-        )
+        The remote-tracking refs in the target record what the last fetch saw,
+        so if every branch of the source still points there, fetching again
+        would be a no-op.
 
-        # Switch back to main branch
+        Args:
+            source_repo: Path to source repository
+            remote_name: Name of the source's remote in the target
+        """
         result = self._run_command(
-            ["git", "rev-parse", "--verify", "main"],
+            ["git", "ls-remote", "--heads", str(source_repo)],
             cwd=self.target_repo,
             check=False
         )
+        if result.returncode != 0 or not result.stdout.strip():
+            return False
+
+        for line in result.stdout.splitlines():
+            oid, _, ref = line.partition("\t")
+            branch = ref[len("refs/heads/"):]
+            if self._resolve_object(f"refs/remotes/{remote_name}/{branch}") != oid:
+                return False
+        return True
+
+    def _prefetch_all(self) -> Dict[Path, Tuple[str, str]]:
+        """
+        Add and fetch all source repositories and resolve their default branches.
+
+        All remotes are fetched by one `git fetch --multiple` invocation, which
+        fetches them in parallel inside a single git process.
+
+        Returns:
+            Mapping of source repository path to (remote name, default branch)
+        """
+        remotes = self._add_all_remotes()
+        remote_names = list(dict.fromkeys(remotes.values()))
+
+        to_fetch = remote_names
+        if self.cache_first:
+            remote_sources = {}
+            for source_repo, remote_name in remotes.items():
+                remote_sources.setdefault(remote_name, source_repo)
+            to_fetch = [name for name in remote_names if not self._remote_is_current(remote_sources[name], name)]
+            if len(to_fetch) < len(remote_names):
+                print(f"\n{len(remote_names) - len(to_fetch)} source repositories unchanged since last fetch")
+
+        if to_fetch:
+            print(f"\nFetching {len(to_fetch)} source repositories...")
+            # Tags are skipped: they aren't needed for the merge, and tags with the
+            # same name in two sources would clobber each other and fail the fetch
+            self._run_command(
+                ["git", "fetch", "--multiple", "--no-tags", "--jobs", str(os.cpu_count() or 1), *to_fetch],
+                cwd=self.target_repo,
+                capture=False
+            )
 
-        if result.returncode != 0:
+        default_branches = self._resolve_default_branches(remote_names)
+        return {
+            source_repo: (remote_name, default_branches[remote_name])
+            for source_repo, remote_name in remotes.items()
+        }
+
+    def _checkout_main(self):
+        """Check out the main branch of the target, creating it if needed."""
+        if not self._object_exists("refs/heads/main"):
             # Create main branch if it doesn't exist
             self._run_command(
                 ["git", "checkout", "-b", "main"],
-                cwd=self.target_repo
+                cwd=self.target_repo,
+                capture=False
             )
         else:
             self._run_command(
                 ["git", "checkout", "main"],
-                cwd=self.target_repo
+                cwd=self.target_repo,
+                capture=False
             )
 
-        # Merge the temporary branch with allow-unrelated-histories
+    def _has_conflicts(self) -> bool:
+        """Check whether the target repository has unmerged paths."""
+        # Raw bytes: no decoding needed, and non-UTF-8 paths can't break it
+        status_result = self._run_command(
+            ["git", "status", "--porcelain"],
+            cwd=self.target_repo,
+            text=False
+        )
+        return CONFLICT_STATUS_RE.search(status_result.stdout) is not None
+
+    def _can_merge_fast(self, source_ref: str) -> bool:
+        """Check whether merging source_ref can be recorded without a working tree."""
+        # Merging into an unborn branch is a fast-forward that git merge handles
+        head = self._resolve_object("HEAD")
+        if head is None:
+            return False
+
+        result = self._run_command(["git", "--version"], cacheable=True)
+        match = re.search(r"(\d+)\.(\d+)", result.stdout)
+        if match is None or tuple(map(int, match.groups())) < MERGE_TREE_MIN_VERSION:
+            return False
+
+        # Already merged (nothing to do) or a fast-forward (no merge commit):
+        # both are left to git merge
+        result = self._run_command(
+            ["git", "merge-base", "HEAD", source_ref],
+            cwd=self.target_repo,
+            check=False
+        )
+        return result.stdout.strip() not in (head, self._resolve_object(source_ref))
+
+    def _write_merge_tree(self, source_ref: str) -> Tuple[str, bool]:
+        """
+        Merge HEAD and source_ref into a new tree without touching the working tree.
+
+        Args:
+            source_ref: Ref to merge into HEAD
+
+        Returns:
+            Tuple of (tree id, whether the tree contains conflict markers)
+        """
+        cmd = ["git", "merge-tree", "--write-tree", "--allow-unrelated-histories", "HEAD", source_ref]
+        result = self._run_command(cmd, cwd=self.target_repo, check=False)
+        # Exit status 1 means the merge had conflicts; the tree holds them with markers
+        if result.returncode not in (0, 1):
+            raise subprocess.CalledProcessError(result.returncode, cmd)
+        return result.stdout.split("\n", 1)[0], result.returncode == 1
+
+    def _merge_commit_fast(self, source_ref: str, message: str, tree: Optional[str] = None):
+        """
+        Record a merge commit of HEAD and source_ref directly with git plumbing.
+
+        The index and working tree are moved to the new commit before HEAD is,
+        so a failure leaves the repository at the previous commit, like a
+        refused git merge would.
+
+        Args:
+            source_ref: Ref being merged into HEAD
+            message: Commit message of the merge commit
+            tree: Tree of the merge commit (defaults to the current tree of HEAD)
+        """
+        result = self._run_command(
+            ["git", "commit-tree", tree or "HEAD^{tree}", "-p", "HEAD", "-p", source_ref, "-m", message],
+            cwd=self.target_repo
+        )
+        commit = result.stdout.strip()
+
+        # Two-tree read-tree refuses to overwrite local changes or untracked
+        # files, like git merge would
+        self._run_command(
+            ["git", "read-tree", "-m", "-u", "HEAD", commit],
+            cwd=self.target_repo,
+            capture=False
+        )
+        try:
+            self._run_command(
+                ["git", "update-ref", "-m", f"merge {source_ref}: {message}", "HEAD", commit],
+                cwd=self.target_repo,
+                capture=False
+            )
+        except subprocess.CalledProcessError:
+            # Put the index and working tree back at HEAD
+            self._run_command(
+                ["git", "read-tree", "-m", "-u", commit, "HEAD"],
+                cwd=self.target_repo,
+                check=False,
+                capture=False
+            )
+            raise
+
+    def _apply_merge(self, source_repo: Path, prefetched: Tuple[str, str],
+                     strategy: str = "ours", custom_strategy: Optional[str] = None):
+        """
+        Merge a single, already fetched repository into the target.
+
+        Args:
+            source_repo: Path to source repository
+            prefetched: (remote name, default branch) as returned by _prefetch_all
+            strategy: Conflict resolution strategy (built-in or custom)
+            custom_strategy: Custom git merge strategy option (e.g., 'ours', 'theirs', 'patience')
+        
+        Merge Context:
+            - "ours" refers to the current state in the target repository (HEAD)
+            - "theirs" refers to the incoming changes from the source repository
+            - When merging multiple repos sequentially, each merge builds on the previous
+              (e.g., repo1 merges into target, then repo2 merges into target+repo1, etc.)
+        """
+        repo_name = source_repo.name
+        remote_name, default_branch = prefetched
+        print(f"\nMerging repository: {source_repo.name}")
+
+        print(f"  Using branch: {default_branch}")
+
+        # Merge the fetched remote branch directly into main
+        source_ref = f"{remote_name}/{default_branch}"
+
+        merge_fast = strategy in ("ours", "ours-only") and not custom_strategy and self._can_merge_fast(source_ref)
+
+        # Merge with allow-unrelated-histories
         print(f"  Merging history with strategy: {strategy}...")
         print(f"  Context: 'ours' = current target state, 'theirs' = incoming from {repo_name}")
         
@@ -171,29 +560,35 @@ class RepoMerger:
         # Handle custom strategy option
         if custom_strategy:
             print(f"  Using custom merge strategy: {custom_strategy}")
-            merge_cmd.extend(["-X", custom_strategy, "-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-X", custom_strategy, "-m", f"Merge {repo_name} repository", source_ref])
             self._run_command(merge_cmd, cwd=self.target_repo)
         
+        elif strategy == "ours" and merge_fast:
+            # Same as below, but the merge is computed without the working tree
+            # and conflicts are committed without a git add -A round trip
+            tree, conflicted = self._write_merge_tree(source_ref)
+            if conflicted:
+                print(f"  ⚠ Merge conflicts detected. Committing with conflict markers.")
+                self._merge_commit_fast(source_ref, f"Merge {repo_name} repository with conflicts", tree)
+            else:
+                self._merge_commit_fast(source_ref, f"Merge {repo_name} repository", tree)
+
         elif strategy == "ours":
             # Keep all changes, leave conflicts unresolved (commit with markers)
-            merge_cmd.extend(["-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-m", f"Merge {repo_name} repository", source_ref])
             result = self._run_command(merge_cmd, cwd=self.target_repo, check=False)
             
             if result.returncode != 0:
-                # Check if there are conflicts
-                status_result = self._run_command(
-                    ["git", "status", "--porcelain"],
-                    cwd=self.target_repo
-                )
-                if any(line.startswith("UU") or line.startswith("AA") or line.startswith("DD") for line in status_result.stdout.split("\n")):
+                if self._has_conflicts():
                     print(f"  ⚠ Merge conflicts detected. Adding all changes and committing with conflicts.")
                     # Add all files (both conflicted and non-conflicted)
-                    self._run_command(["git", "add", "-A"], cwd=self.target_repo)
+                    self._run_command(["git", "add", "-A"], cwd=self.target_repo, capture=False)
                     # Commit with conflicts marked
                     self._run_command(
                         ["git", "commit", "--no-edit", "-m", f"Merge {repo_name} repository with conflicts"],
                         cwd=self.target_repo,
-                        check=False
+                        check=False,
+                        capture=False
                     )
                 else:
                     # If it's not a conflict, re-raise the error
@@ -201,53 +596,48 @@ class RepoMerger:
         
         elif strategy == "theirs":
             # Accept all changes from source repository
-            merge_cmd.extend(["-X", "theirs", "-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-X", "theirs", "-m", f"Merge {repo_name} repository", source_ref])
             self._run_command(merge_cmd, cwd=self.target_repo)
         
+        elif strategy == "ours-only" and merge_fast:
+            # The result is the current tree, so only the merge commit is needed
+            self._merge_commit_fast(source_ref, f"Merge {repo_name} repository (keeping current state)")
+
         elif strategy == "ours-only":
             # Discard all changes from source repository (keep only current state)
-            merge_cmd.extend(["-s", "ours", "-m", f"Merge {repo_name} repository (keeping current state)", merge_branch])
+            merge_cmd.extend(["-s", "ours", "-m", f"Merge {repo_name} repository (keeping current state)", source_ref])
             self._run_command(merge_cmd, cwd=self.target_repo)
         
         elif strategy == "recursive-ours":
             # Favor our changes in conflicts (but still merge non-conflicting changes)
-            merge_cmd.extend(["-X", "ours", "-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-X", "ours", "-m", f"Merge {repo_name} repository", source_ref])
             self._run_command(merge_cmd, cwd=self.target_repo)
         
         elif strategy == "patience":
             # Use patience diff algorithm for better conflict resolution
-            merge_cmd.extend(["-X", "patience", "-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-X", "patience", "-m", f"Merge {repo_name} repository", source_ref])
             result = self._run_command(merge_cmd, cwd=self.target_repo, check=False)
             
             if result.returncode != 0:
-                # Handle any conflicts
-                status_result = self._run_command(
-                    ["git", "status", "--porcelain"],
-                    cwd=self.target_repo
-                )
-                if any(line.startswith("UU") or line.startswith("AA") or line.startswith("DD") for line in status_result.stdout.split("\n")):
+                if self._has_conflicts():
                     print(f"  ⚠ Merge conflicts detected even with patience. Adding all changes and committing with conflicts.")
-                    self._run_command(["git", "add", "-A"], cwd=self.target_repo)
+                    self._run_command(["git", "add", "-A"], cwd=self.target_repo, capture=False)
                     self._run_command(
                         ["git", "commit", "--no-edit", "-m", f"Merge {repo_name} repository with conflicts (patience)"],
                         cwd=self.target_repo,
-                        check=False
+                        check=False,
+                        capture=False
                     )
                 else:
                     raise subprocess.CalledProcessError(result.returncode, merge_cmd)
         
         elif strategy == "manual":
             # Open prompt for user to resolve conflicts
-            merge_cmd.extend(["-m", f"Merge {repo_name} repository", merge_branch])
+            merge_cmd.extend(["-m", f"Merge {repo_name} repository", source_ref])
             result = self._run_command(merge_cmd, cwd=self.target_repo, check=False)
             
             if result.returncode != 0:
-                # Check if there are conflicts
-                status_result = self._run_command(
-                    ["git", "status", "--porcelain"],
-                    cwd=self.target_repo
-                )
-                if any(line.startswith("UU") or line.startswith("AA") or line.startswith("DD") for line in status_result.stdout.split("\n")):
+                if self._has_conflicts():
                     print(f"\n  ⚠ Merge conflicts detected!")
                     print(f"  Please resolve the conflicts manually.")
                     print(f"  After resolving, run:")
@@ -272,13 +662,6 @@ class RepoMerger:
             # Unknown strategy - raise error
             raise ValueError(f"Unknown merge strategy: {strategy}. Use one of the built-in strategies or provide --custom-strategy.")
 
-        # Clean up
-        self._run_command(
-            ["git", "branch", "-d", merge_branch],
-            cwd=self.target_repo,
-            check=False
-        )
-
         print(f"  ✓ Successfully merged {repo_name}")
 
     def merge(self, strategy: str = "ours", custom_strategy: Optional[str] = None):
@@ -305,10 +688,20 @@ class RepoMerger:
         # Initialize target repository
         self._initialize_target_repo()
 
-        # Merge each source repository
-        for i, source_repo in enumerate(self.source_repos, 1):
-            print(f"\n[{i}/{len(self.source_repos)}] Processing {source_repo.name}")
-            self._merge_repo(source_repo, strategy, custom_strategy)
+        try:
+            # Every source is merged straight into main, so check it out once
+            self._checkout_main()
+
+            # Fetch all source repositories up front; merging mutates the
+            # target's index and working tree, so it stays sequential
+            prefetched = self._prefetch_all()
+
+            # Merge each source repository
+            for i, source_repo in enumerate(self.source_repos, 1):
+                print(f"\n[{i}/{len(self.source_repos)}] Processing {source_repo.name}")
+                self._apply_merge(source_repo, prefetched[source_repo], strategy, custom_strategy)
+        finally:
+            self.close()
 
         print(f"\n✓ Successfully merged all repositories into {self.target_repo}")
         print(f"\nTo view the result:")
@@ -318,6 +711,9 @@ class RepoMerger:
 
 def main():
     """Main entry point for the script."""
+    # Imported here so importing RepoMerger as a library doesn't pay for it
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Merge multiple git repositories into a single repository, preserving history."
     )
@@ -348,6 +744,11 @@ def main():
         help="Custom git merge strategy option (e.g., 'ignore-space-change', 'rename-threshold=50'). "
              "This is passed to 'git merge -X <OPTION>'. Overrides --strategy if provided."
     )
+    parser.add_argument(
+        "--cache-first",
+        action="store_true",
+        help="Skip fetching source repositories whose branches haven't changed since the last run"
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -361,7 +762,8 @@ def main():
         sys.exit(1)
 
     try:
-        merger = RepoMerger(args.target_repo, args.source_repos, verbose=args.verbose)
+        merger = RepoMerger(args.target_repo, args.source_repos, verbose=args.verbose,
+                            cache_first=args.cache_first)
         merger.merge(strategy=args.strategy, custom_strategy=args.custom_strategy)
     except Exception as e:
         print(f"Error: {e}")
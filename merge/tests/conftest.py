@@ -0,0 +1,37 @@
+"""
+Shared pytest configuration for merge.py tests.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+# Base temp directory created on tmpfs for this run, removed when it ends
+_tmpfs_basetemp = None
+
+
+def pytest_configure(config):
+    """Keep pytest's temporary directories on tmpfs (/dev/shm) when available.
+
+    The tests create and delete many small git repositories; on tmpfs the
+    object database writes and the cleanup never touch the disk. Only pytest's
+    base temp directory is moved, so the environment of the code under test is
+    unchanged. Each run gets its own directory, so concurrent runs don't clear
+    each other's, and it is removed at the end so nothing stays in memory. An
+    explicit --basetemp or TMPDIR is left alone.
+    """
+    global _tmpfs_basetemp
+    if config.option.basetemp or "TMPDIR" in os.environ or sys.platform != "linux":
+        return
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        _tmpfs_basetemp = tempfile.mkdtemp(prefix="pytest-merge-", dir="/dev/shm")
+        config.option.basetemp = _tmpfs_basetemp
+
+
+def pytest_unconfigure(config):
+    """Remove the tmpfs base temp directory created for this run."""
+    global _tmpfs_basetemp
+    if _tmpfs_basetemp is not None:
+        shutil.rmtree(_tmpfs_basetemp, ignore_errors=True)
+        _tmpfs_basetemp = None
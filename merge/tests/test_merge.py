@@ -6,8 +6,9 @@ Tests for merge.py script.
 import os
 import shutil
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -17,86 +18,122 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from merge import RepoMerger
 
 
+# Identity for commits made by the tests themselves. It is only passed to
+# those git calls, so merge commits rely on the target repository's config
+GIT_IDENTITY_ENV = {
+    "GIT_AUTHOR_NAME": "Test User",
+    "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test User",
+    "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_git_config():
+    """Don't read the user's global git config (also keeps git start-up cheap)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GIT_CONFIG_GLOBAL", os.devnull)
+        yield
+
+
+def _make_sample_repo(repo_path, i):
+    """Create a sample git repository with two commits."""
+    repo_path.mkdir()
+
+    # Create the files of both commits up front
+    (repo_path / f"file{i+1}.txt").write_text(f"Content from repo {i+1}\n")
+    (repo_path / "README.md").write_text(f"# Repository {i+1}\n")
+    (repo_path / f"file{i+1}_v2.txt").write_text(f"Second file from repo {i+1}\n")
+
+    # Initialize the repo and make both commits in a single shell invocation.
+    # Plumbing stages just the named files and writes the commits directly,
+    # so git never scans the working tree the way add and commit do
+    script = " && ".join([
+        "git init -q",
+        f"git update-index --add README.md file{i+1}.txt",
+        f"first=$(git commit-tree $(git write-tree) -m 'Initial commit for repo{i+1}')",
+        f"git update-index --add file{i+1}_v2.txt",
+        f"second=$(git commit-tree $(git write-tree) -p $first -m 'Second commit for repo{i+1}')",
+        "git update-ref HEAD $second",
+    ])
+    subprocess.run(
+        script, shell=True, cwd=repo_path, env=dict(os.environ, **GIT_IDENTITY_ENV),
+        check=True, capture_output=True
+    )
+
+
 class TestRepoMerger:
     """Test suite for RepoMerger class."""
 
-    @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for testing."""
-        temp_dir = tempfile.mkdtemp()
-        yield Path(temp_dir)
-        shutil.rmtree(temp_dir)
+    @pytest.fixture(scope="session")
+    def _sample_repos_template(self, tmp_path_factory):
+        """Create the sample git repositories once per test session."""
+        template_dir = tmp_path_factory.mktemp("sample_repos")
+        repo_paths = [template_dir / f"repo{i+1}" for i in range(3)]
+        # The repositories are independent, so build them concurrently
+        with ThreadPoolExecutor(max_workers=len(repo_paths)) as executor:
+            list(executor.map(_make_sample_repo, repo_paths, range(len(repo_paths))))
+        return repo_paths
 
     @pytest.fixture
-    def sample_repos(self, temp_dir):
+    def sample_repos(self, tmp_path, _sample_repos_template):
         """Create sample git repositories for testing."""
+        # Tests may modify the repositories, so each one gets its own copy
         repos = []
-        for i in range(3):
-            repo_path = temp_dir / f"repo{i+1}"
-            repo_path.mkdir()
-
-            # Initialize git repo
-            subprocess.run(["git", "init"], cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(["git", "config", "user.name", "Test User"], cwd=repo_path, check=True, capture_output=True)
-
-            # Create some files
-            (repo_path / f"file{i+1}.txt").write_text(f"Content from repo {i+1}\n")
-            (repo_path / "README.md").write_text(f"# Repository {i+1}\n")
-
-            # Commit the files
-            subprocess.run(["git", "add", "."], cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(
-                ["git", "commit", "-m", f"Initial commit for repo{i+1}"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True
-            )
-
-            # Create another commit
-            (repo_path / f"file{i+1}_v2.txt").write_text(f"Second file from repo {i+1}\n")
-            subprocess.run(["git", "add", "."], cwd=repo_path, check=True, capture_output=True)
-            subprocess.run(
-                ["git", "commit", "-m", f"Second commit for repo{i+1}"],
-                cwd=repo_path,
-                check=True,
-                capture_output=True
-            )
-
+        for template in _sample_repos_template:
+            repo_path = tmp_path / template.name
+            shutil.copytree(template, repo_path, symlinks=True)
             repos.append(repo_path)
+        return repos
 
+    @pytest.fixture
+    def fake_repos(self, tmp_path):
+        """Create directories that look like git repositories, without running git."""
+        repos = []
+        for i in range(3):
+            repo_path = tmp_path / f"repo{i+1}"
+            (repo_path / ".git").mkdir(parents=True)
+            repos.append(repo_path)
         return repos
 
-    def test_merger_initialization(self, temp_dir, sample_repos):
+    def test_merger_initialization(self, tmp_path, fake_repos):
         """Test that RepoMerger initializes correctly."""
-        target = temp_dir / "target"
-        merger = RepoMerger(str(target), [str(r) for r in sample_repos])
+        target = tmp_path / "target"
+        merger = RepoMerger(str(target), [str(r) for r in fake_repos])
 
         assert merger.target_repo == target
         assert len(merger.source_repos) == 3
 
-    def test_validate_repos_success(self, temp_dir, sample_repos):
+    def test_merger_initialization_symlink(self, tmp_path, fake_repos):
+        """Test that a symlinked source repository is resolved to the real path."""
+        link = tmp_path / "link_to_repo1"
+        link.symlink_to(fake_repos[0])
+        merger = RepoMerger(str(tmp_path / "target"), [str(link)])
+
+        assert merger.source_repos == [fake_repos[0].resolve()]
+
+    def test_validate_repos_success(self, tmp_path, fake_repos):
         """Test that validation passes for valid repositories."""
-        target = temp_dir / "target"
-        merger = RepoMerger(str(target), [str(r) for r in sample_repos])
+        target = tmp_path / "target"
+        merger = RepoMerger(str(target), [str(r) for r in fake_repos])
 
         # Should not raise any exception
         merger._validate_repos()
 
-    def test_validate_repos_nonexistent(self, temp_dir):
+    def test_validate_repos_nonexistent(self, tmp_path):
         """Test that validation fails for non-existent repositories."""
-        target = temp_dir / "target"
-        non_existent = temp_dir / "nonexistent"
+        target = tmp_path / "target"
+        non_existent = tmp_path / "nonexistent"
 
         merger = RepoMerger(str(target), [str(non_existent)])
 
         with pytest.raises(ValueError, match="does not exist"):
             merger._validate_repos()
 
-    def test_validate_repos_not_git(self, temp_dir):
+    def test_validate_repos_not_git(self, tmp_path):
         """Test that validation fails for non-git directories."""
-        target = temp_dir / "target"
-        not_git = temp_dir / "not_git"
+        target = tmp_path / "target"
+        not_git = tmp_path / "not_git"
         not_git.mkdir()
 
         merger = RepoMerger(str(target), [str(not_git)])
@@ -104,9 +141,10 @@ class TestRepoMerger:
         with pytest.raises(ValueError, match="Not a git repository"):
             merger._validate_repos()
 
-    def test_initialize_target_repo_new(self, temp_dir):
+    @pytest.mark.integration
+    def test_initialize_target_repo_new(self, tmp_path):
         """Test initialization of a new target repository."""
-        target = temp_dir / "new_target"
+        target = tmp_path / "new_target"
         merger = RepoMerger(str(target), [])
 
         merger._initialize_target_repo()
@@ -114,9 +152,19 @@ class TestRepoMerger:
         assert target.exists()
         assert (target / ".git").exists()
 
-    def test_initialize_target_repo_existing(self, temp_dir):
+        result = subprocess.run(
+            ["git", "config", "user.name"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout.strip() == "Repo Merger"
+
+    @pytest.mark.integration
+    def test_initialize_target_repo_existing(self, tmp_path):
         """Test initialization with existing target repository."""
-        target = temp_dir / "existing_target"
+        target = tmp_path / "existing_target"
         target.mkdir()
         subprocess.run(["git", "init"], cwd=target, check=True, capture_output=True)
 
@@ -128,9 +176,10 @@ class TestRepoMerger:
         assert target.exists()
         assert (target / ".git").exists()
 
-    def test_merge_with_theirs_strategy(self, temp_dir, sample_repos):
+    @pytest.mark.integration
+    def test_merge_with_theirs_strategy(self, tmp_path, sample_repos):
         """Test merging repositories with theirs strategy."""
-        target = temp_dir / "merged"
+        target = tmp_path / "merged"
         merger = RepoMerger(str(target), [str(r) for r in sample_repos], verbose=True)
 
         merger.merge(strategy="theirs")
@@ -156,9 +205,10 @@ class TestRepoMerger:
         assert "repo1" in result.stdout or "Initial commit" in result.stdout
         assert len(result.stdout.split("\n")) > 3  # At least multiple commits
 
-    def test_merge_with_recursive_ours_strategy(self, temp_dir, sample_repos):
+    @pytest.mark.integration
+    def test_merge_with_recursive_ours_strategy(self, tmp_path, sample_repos):
         """Test merging repositories with recursive-ours strategy."""
-        target = temp_dir / "merged_recursive_ours"
+        target = tmp_path / "merged_recursive_ours"
         merger = RepoMerger(str(target), [str(r) for r in sample_repos], verbose=True)
 
         merger.merge(strategy="recursive-ours")
@@ -172,9 +222,10 @@ class TestRepoMerger:
         assert (target / "file2.txt").exists()
         assert (target / "file3.txt").exists()
 
-    def test_merge_with_custom_strategy(self, temp_dir, sample_repos):
+    @pytest.mark.integration
+    def test_merge_with_custom_strategy(self, tmp_path, sample_repos):
         """Test merging repositories with custom strategy option."""
-        target = temp_dir / "merged_custom"
+        target = tmp_path / "merged_custom"
         merger = RepoMerger(str(target), [str(r) for r in sample_repos], verbose=True)
 
         merger.merge(strategy="theirs", custom_strategy="theirs")
@@ -188,9 +239,10 @@ class TestRepoMerger:
         assert (target / "file2.txt").exists()
         assert (target / "file3.txt").exists()
 
-    def test_merge_with_ours_strategy_conflicts(self, temp_dir, sample_repos):
+    @pytest.mark.integration
+    def test_merge_with_ours_strategy_conflicts(self, tmp_path, sample_repos):
         """Test merging repositories with ours strategy leaves conflicts unresolved."""
-        target = temp_dir / "merged_flat"
+        target = tmp_path / "merged_flat"
         merger = RepoMerger(str(target), [str(r) for r in sample_repos], verbose=True)
 
         # With ours strategy, conflicts should be left unresolved
@@ -201,9 +253,153 @@ class TestRepoMerger:
         assert target.exists()
         assert (target / ".git").exists()
 
-    def test_merge_preserves_history(self, temp_dir, sample_repos):
+        # The conflicting README.md is committed with markers, and the index
+        # and working tree match the final merge commit
+        assert "<<<<<<<" in (target / "README.md").read_text()
+        result = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout == ""
+
+        # repo1 is a fast-forward; repo2 and repo3 each get a two-parent merge commit
+        result = subprocess.run(
+            ["git", "log", "--merges", "--format=%p|%s"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        merges = [line.split("|", 1) for line in result.stdout.splitlines()]
+        assert len(merges) == 2
+        assert all(len(parents.split()) == 2 for parents, _ in merges)
+        assert merges[-1][1] == "Merge repo2 repository with conflicts"
+
+    @pytest.mark.integration
+    def test_merge_with_patience_strategy_conflicts(self, tmp_path, sample_repos):
+        """Test that patience strategy commits conflicting merges with markers."""
+        target = tmp_path / "merged_patience"
+        merger = RepoMerger(str(target), [str(r) for r in sample_repos[:2]])
+
+        merger.merge(strategy="patience")
+
+        assert (target / "file1.txt").exists()
+        assert (target / "file2.txt").exists()
+        assert "<<<<<<<" in (target / "README.md").read_text()
+        assert not merger._has_conflicts()
+
+    @pytest.mark.integration
+    def test_merge_with_ours_only_strategy(self, tmp_path, sample_repos):
+        """Test merging repositories with ours-only strategy keeps the current tree."""
+        target = tmp_path / "merged_ours_only"
+        merger = RepoMerger(str(target), [str(r) for r in sample_repos])
+
+        merger.merge(strategy="ours-only")
+
+        # Only the first repository's files make it into the tree
+        assert (target / "file1.txt").exists()
+        assert not (target / "file2.txt").exists()
+        assert not (target / "file3.txt").exists()
+
+        # The index and working tree match the final merge commit
+        result = subprocess.run(
+            ["git", "status", "--porcelain"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout == ""
+
+        # Merge commits use the identity written into the target's config
+        result = subprocess.run(
+            ["git", "log", "-1", "--format=%an|%cn"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout.strip() == "Repo Merger|Repo Merger"
+
+        result = subprocess.run(
+            ["git", "log", "--merges", "--oneline"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert len(result.stdout.splitlines()) == 2
+
+    @pytest.mark.integration
+    def test_merge_twice_is_noop(self, tmp_path, sample_repos):
+        """Test that merging already merged repositories adds no commits."""
+        target = tmp_path / "merged_twice"
+        RepoMerger(str(target), [str(r) for r in sample_repos]).merge(strategy="ours-only")
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=target, capture_output=True, text=True, check=True
+        ).stdout
+
+        RepoMerger(str(target), [str(r) for r in sample_repos]).merge(strategy="ours-only")
+
+        assert subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=target, capture_output=True, text=True, check=True
+        ).stdout == head
+
+    @pytest.mark.integration
+    def test_merge_failure_leaves_repo_consistent(self, tmp_path, sample_repos):
+        """Test that a merge refused partway through doesn't move HEAD past the working tree."""
+        target = tmp_path / "merged_refused"
+        subprocess.run(["git", "init", str(target)], check=True, capture_output=True)
+        # An existing target keeps its own config, so it needs an identity to commit with
+        subprocess.run(["git", "config", "user.name", "Test User"], cwd=target, check=True)
+        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=target, check=True)
+        # An untracked file in the way of repo2's file2.txt makes its merge refuse
+        (target / "file2.txt").write_text("Untracked local file\n")
+
+        with pytest.raises(subprocess.CalledProcessError) as excinfo:
+            RepoMerger(str(target), [str(r) for r in sample_repos]).merge(strategy="ours")
+        assert excinfo.value.cmd[:2] == ["git", "read-tree"]
+
+        log = subprocess.run(
+            ["git", "log", "--format=%s"], cwd=target, capture_output=True, text=True, check=True
+        ).stdout
+        assert "repo2" not in log
+        assert "Second commit for repo1" in log
+        # HEAD, index and working tree agree; only the untracked file is reported
+        status = subprocess.run(
+            ["git", "status", "--porcelain"], cwd=target, capture_output=True, text=True, check=True
+        ).stdout
+        assert status == "?? file2.txt\n"
+        assert (target / "file2.txt").read_text() == "Untracked local file\n"
+
+    @pytest.mark.integration
+    def test_remote_is_current(self, tmp_path, sample_repos):
+        """Test detecting sources that haven't changed since the last fetch."""
+        target = tmp_path / "merged_cache_first"
+        RepoMerger(str(target), [str(sample_repos[0])]).merge(strategy="theirs")
+
+        merger = RepoMerger(str(target), [str(sample_repos[0])], cache_first=True)
+        try:
+            assert merger._remote_is_current(sample_repos[0], "source_repo1")
+
+            (sample_repos[0] / "new.txt").write_text("New file\n")
+            subprocess.run(["git", "add", "."], cwd=sample_repos[0], check=True, capture_output=True)
+            subprocess.run(
+                ["git", "commit", "-m", "Third commit"], cwd=sample_repos[0],
+                env=dict(os.environ, **GIT_IDENTITY_ENV), check=True, capture_output=True
+            )
+
+            assert not merger._remote_is_current(sample_repos[0], "source_repo1")
+        finally:
+            merger.close()
+
+    @pytest.mark.integration
+    def test_merge_preserves_history(self, tmp_path, sample_repos):
         """Test that merge preserves git history from all repos."""
-        target = temp_dir / "merged_history"
+        target = tmp_path / "merged_history"
         merger = RepoMerger(str(target), [str(r) for r in sample_repos])
 
         merger.merge(strategy="theirs")
@@ -222,9 +418,10 @@ class TestRepoMerger:
         # We should see evidence of the original commits
         assert len(log_output.split("\n")) >= 6  # At least 6 commits total
 
-    def test_merge_single_repo(self, temp_dir, sample_repos):
+    @pytest.mark.integration
+    def test_merge_single_repo(self, tmp_path, sample_repos):
         """Test merging a single repository."""
-        target = temp_dir / "merged_single"
+        target = tmp_path / "merged_single"
         merger = RepoMerger(str(target), [str(sample_repos[0])])
 
         merger.merge(strategy="ours")
@@ -234,17 +431,98 @@ class TestRepoMerger:
         assert (target / ".git").exists()
         assert (target / "file1.txt").exists()
 
-    def test_run_command_success(self, temp_dir):
+    @pytest.mark.integration
+    def test_bulk_add_remotes(self, tmp_path, sample_repos):
+        """Test that remotes written to .git/config are picked up by git."""
+        target = tmp_path / "target"
+        merger = RepoMerger(str(target), [str(r) for r in sample_repos])
+        merger._initialize_target_repo()
+
+        merger._bulk_add_remotes({"source_repo1": sample_repos[0], "source_repo2": sample_repos[1]})
+        # Already configured remotes are skipped
+        merger._bulk_add_remotes({"source_repo1": sample_repos[2]})
+
+        result = subprocess.run(
+            ["git", "remote", "get-url", "source_repo1"],
+            cwd=target,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        assert result.stdout.strip() == str(sample_repos[0])
+
+        result = subprocess.run(["git", "remote"], cwd=target, capture_output=True, text=True, check=True)
+        assert result.stdout.split() == ["source_repo1", "source_repo2"]
+
+    def test_read_symbolic_ref(self, tmp_path):
+        """Test reading a remote's default branch without invoking git."""
+        target = tmp_path / "target"
+        remote_dir = target / ".git" / "refs" / "remotes" / "source_repo"
+        remote_dir.mkdir(parents=True)
+        (remote_dir / "HEAD").write_text("ref: refs/remotes/source_repo/develop\n")
+
+        merger = RepoMerger(str(target), [])
+
+        assert merger._read_symbolic_ref("source_repo") == "develop"
+        assert merger._read_symbolic_ref("missing") is None
+
+    @pytest.mark.integration
+    def test_object_exists(self, tmp_path, sample_repos):
+        """Test ref lookups through the long-lived cat-file process."""
+        merger = RepoMerger(str(sample_repos[0]), [])
+
+        try:
+            assert merger._object_exists("HEAD")
+            assert not merger._object_exists("refs/heads/does-not-exist")
+        finally:
+            merger.close()
+
+        assert merger._cat_file_proc is None
+
+    @patch("merge.subprocess.run", return_value=MagicMock(returncode=0, stdout="test\n"))
+    def test_run_command_success(self, mock_run, tmp_path):
         """Test _run_command with successful command."""
-        merger = RepoMerger(str(temp_dir / "target"), [])
+        merger = RepoMerger(str(tmp_path / "target"), [])
         result = merger._run_command(["echo", "test"])
 
         assert result.returncode == 0
         assert "test" in result.stdout
+        assert mock_run.call_args[0][0] == ["echo", "test"]
+
+    @patch("merge.subprocess.run", return_value=MagicMock(returncode=0, stdout=""))
+    def test_run_command_git_overrides(self, mock_run, tmp_path):
+        """Test that git commands get the config overrides and environment."""
+        merger = RepoMerger(str(tmp_path / "target"), [])
+        merger._run_command(["git", "status"])
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[0] == "git" and cmd[-1] == "status"
+        assert "gc.auto=0" in cmd
+        assert mock_run.call_args[1]["env"]["GIT_OPTIONAL_LOCKS"] == "0"
+
+    @patch("merge.subprocess.run", return_value=MagicMock(returncode=0, stdout=None))
+    def test_run_command_no_capture(self, mock_run, tmp_path):
+        """Test _run_command discards stdout when capture is disabled."""
+        merger = RepoMerger(str(tmp_path / "target"), [])
+        result = merger._run_command(["echo", "test"], capture=False)
+
+        assert result.returncode == 0
+        assert mock_run.call_args[1]["stdout"] == subprocess.DEVNULL
+
+    @patch("merge.subprocess.run", return_value=MagicMock(returncode=0, stdout="cached\n"))
+    def test_run_command_cacheable(self, mock_run, tmp_path):
+        """Test that cacheable commands are only run once."""
+        merger = RepoMerger(str(tmp_path / "target"), [])
+        cmd = ["echo", "cached"]
+
+        first = merger._run_command(cmd, cacheable=True)
+        assert merger._run_command(cmd, cacheable=True) is first
+        assert mock_run.call_count == 1
 
-    def test_run_command_failure(self, temp_dir):
+    @patch("merge.subprocess.run", return_value=MagicMock(returncode=1, stdout="", stderr=""))
+    def test_run_command_failure(self, mock_run, tmp_path):
         """Test _run_command with failing command."""
-        merger = RepoMerger(str(temp_dir / "target"), [])
+        merger = RepoMerger(str(tmp_path / "target"), [])
 
         with pytest.raises(subprocess.CalledProcessError):
             merger._run_command(["false"], check=True)
@@ -8,11 +8,147 @@ Opens a list of programs based on groups defined in a JSON configuration file.
 import argparse
 import json
 import os
-import platform
-import subprocess
+import re
+import shlex
+import shutil
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+# orjson parses faster when it's installed; the standard library is enough
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# The platform can't change while we run, so look it up only once. This is
+# what platform.system() returns, without importing platform: the kernel
+# name where os.uname() exists, and "Windows" where it doesn't
+_SYSTEM = os.uname().sysname if hasattr(os, "uname") else "Windows"
+
+# Programs that are URLs
+_URL_RE = re.compile(r"^(?:https?://|www\.)", re.IGNORECASE)
+# Chrome tab descriptions: mention "chrome" and "tab" or "with", in any order
+_CHROME_RE = re.compile(r"^(?=.*chrome)(?=.*(?:tab|with))", re.IGNORECASE | re.DOTALL)
+# Known sites in chrome tab descriptions; alternatives are tried in order, so
+# earlier ones win when a description mentions several
+_SITE_RE = re.compile(
+    r"^(?:(?=.*speed (?:check|test))(?P<speedtest>)"
+    r"|(?=.*github)(?P<github>)"
+    r"|(?=.*google)(?P<google>))",
+    re.IGNORECASE | re.DOTALL,
+)
+_SITE_URLS = {
+    "speedtest": "https://www.speedtest.net",
+    "github": "https://github.com",
+    "google": "https://www.google.com",
+}
+
+# Normalize common application names. Keys are lowercase, to match the
+# lowercased name being looked up; values are tuples as they never change
+_APP_MAP: Dict[str, Tuple[str, ...]] = {
+    "vscode": ("code", "Code", "Visual Studio Code"),
+    "vs code": ("code", "Code", "Visual Studio Code"),
+    "league": ("LeagueClient", "League of Legends"),
+    "professor": ("professor.gg", "Professor"),
+    "chrome": ("google-chrome", "chrome", "Google Chrome"),
+    "firefox": ("firefox", "Firefox"),
+    "spotify": ("spotify", "Spotify"),
+    "discord": ("discord", "Discord"),
+    "slack": ("slack", "Slack"),
+}
+
+# Parsed configuration files, keyed by (path, mtime, size) so an edited file
+# is read again. An edit that keeps the size and lands within the file
+# system's timestamp granularity of the previous write isn't noticed.
+_CFG_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _spawn(args: List[str], shell: bool = False) -> None:
+    """Start a program detached from the launcher.
+
+    The program gets its own session, so it keeps running when the
+    launcher's terminal goes away. subprocess already starts children with
+    vfork/posix_spawn on Linux (Python 3.10+), so the launcher's memory
+    isn't copied for each launch.
+
+    Args:
+        args: Program and arguments to run
+        shell: Run through the shell (needed for Windows' "start")
+    """
+    # Imported here so listing groups doesn't pay for importing subprocess
+    import subprocess
+
+    subprocess.Popen(
+        args,
+        shell=shell,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+# Commands that open a URL and start an application on this platform, chosen
+# once so launching doesn't check the platform for every program. Both the
+# single and the batched launches build their commands with these.
+# _app_argv returns None when the application can't be found.
+_APP_DISPATCH: Dict[str, List[str]] = {}
+if _SYSTEM == "Darwin":  # macOS
+    _USE_SHELL = False
+
+    def _url_argv(url: str) -> List[str]:
+        return ["open", url]
+
+    def _app_argv(app_name: str) -> Optional[List[str]]:
+        names = _APP_MAP.get(app_name.lower())
+        return ["open", "-a", names[0] if names else app_name]
+elif _SYSTEM == "Windows":
+    # "start" is a shell builtin
+    _USE_SHELL = True
+
+    def _url_argv(url: str) -> List[str]:
+        return ["start", url]
+
+    def _app_argv(app_name: str) -> Optional[List[str]]:
+        names = _APP_MAP.get(app_name.lower())
+        return ["start", names[0] if names else app_name]
+else:  # Linux and others
+    _USE_SHELL = False
+
+    def _url_argv(url: str) -> List[str]:
+        return ["xdg-open", url]
+
+    def _which_app(name: str) -> Optional[str]:
+        # Look the executable up on PATH, then under common snap/flatpak
+        # prefixes; a missing application costs a few stats, not failed execs
+        for candidate in (name, "/snap/bin/" + name, "/usr/bin/" + name, "/usr/local/bin/" + name):
+            path = shutil.which(candidate)
+            if path:
+                return path
+        return None
+
+    # The installed executables for each known application, resolved once
+    _APP_DISPATCH = {
+        key: [path for path in map(_which_app, names) if path]
+        for key, names in _APP_MAP.items()
+    }
+
+    def _app_argv(app_name: str) -> Optional[List[str]]:
+        app_lower = app_name.lower()
+        resolved = _APP_DISPATCH.get(app_lower)
+        if resolved:
+            return [resolved[0]]
+        for name in _APP_MAP.get(app_lower) or (app_name,):
+            path = _which_app(name)
+            if path:
+                return [path]
+        return None
+
+# Batched commands run inside /bin/sh, where a failed start can't be
+# reported, so URLs are only batched when the opener is installed
+# (applications are only batched once their executable has been found)
+_URL_OPENER_FOUND = shutil.which(_url_argv("")[0]) is not None
 
 
 class ProgramLauncher:
@@ -31,22 +167,36 @@ class ProgramLauncher:
 
     def _load_config(self) -> Dict[str, Any]:
         """Load and validate the configuration file."""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
-
+        # A single stat both checks that the file exists and keys the cache
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in configuration file: {e}")
+            st = self.config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {self.config_path}") from None
+        cache_key = (str(self.config_path), st.st_mtime_ns, st.st_size)
+        config = _CFG_CACHE.get(cache_key)
+        if config is None:
+            try:
+                # Both parsers take bytes, so skip decoding to str first
+                config = _json_loads(self.config_path.read_bytes())
+            except json.JSONDecodeError as e:  # orjson's error is a subclass
+                raise ValueError(f"Invalid JSON in configuration file: {e}")
+
+            if "groups" not in config:
+                raise ValueError("Configuration file must contain a 'groups' key")
 
-        if "groups" not in config:
-            raise ValueError("Configuration file must contain a 'groups' key")
+            if not isinstance(config["groups"], dict):
+                raise ValueError("'groups' must be a dictionary")
 
-        if not isinstance(config["groups"], dict):
-            raise ValueError("'groups' must be a dictionary")
+            # Program lists are stored as tuples so launchers can share them
+            config["groups"] = {
+                name: tuple(programs) if isinstance(programs, list) else programs
+                for name, programs in config["groups"].items()
+            }
+            _CFG_CACHE[cache_key] = config
 
-        return config
+        # Each launcher gets its own dicts, so changing one's config doesn't
+        # change the others or the cache
+        return dict(config, groups=dict(config["groups"]))
 
     def list_groups(self) -> List[str]:
         """List all available groups."""
@@ -63,13 +213,86 @@ class ProgramLauncher:
             raise ValueError(f"Group '{group_name}' not found. Available groups: {available}")
 
         programs = self.config["groups"][group_name]
-        if not isinstance(programs, list):
+        if not isinstance(programs, (list, tuple)):
             raise ValueError(f"Group '{group_name}' must contain a list of programs")
 
         print(f"Launching group '{group_name}' with {len(programs)} program(s)...")
 
+        # Programs whose command is known up front are started together;
+        # the rest go through the per-program search. The batch so far is
+        # started before such a program, so programs start in group order
+        batch = []
         for program in programs:
-            self._launch_program(program)
+            entry = self._batch_command(program)
+            if entry is None:
+                self._launch_batch(batch)
+                batch = []
+                self._launch_program(program)
+            else:
+                batch.append((program.strip(), *entry))
+
+        self._launch_batch(batch)
+
+    def _batch_command(self, program: str) -> Optional[Tuple[List[str], str]]:
+        """Build the command for a program if it can be known without trying to launch it.
+        
+        Args:
+            program: Program description (can be an app name or URL)
+            
+        Returns:
+            Tuple of (command to run, verbose message once started), or None
+            if the program needs _launch_program (empty entries, applications
+            that aren't found, URLs without an installed opener, and
+            everything that has to go through the Windows shell)
+        """
+        program = program.strip()
+        if not program or _USE_SHELL:
+            return None
+
+        if _URL_RE.match(program):
+            url = self._normalize_url(program)
+        elif _CHROME_RE.match(program):
+            url = self._normalize_url(self._extract_url_from_description(program))
+        else:
+            command = _app_argv(program)
+            if command is None:
+                return None
+            return command, f"Opened application: {command[-1]}"
+
+        if not _URL_OPENER_FOUND:
+            return None
+        return _url_argv(url), f"Opened URL: {url}"
+
+    def _launch_batch(self, batch: List[Tuple[str, List[str], str]]) -> None:
+        """Start several programs with a single shell process.
+        
+        If the process can't be started, each program is launched on its own
+        instead, so failures are reported per program.
+
+        Args:
+            batch: (program description, command, verbose message) tuples
+        """
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            args = batch[0][1]
+        else:
+            # shlex.join would need Python 3.8
+            script = " ".join(" ".join(map(shlex.quote, command)) + " &" for _, command, _ in batch)
+            args = ["/bin/sh", "-c", script]
+
+        try:
+            _spawn(args)
+        except Exception:
+            for program, _, _ in batch:
+                self._launch_program(program)
+            return
+
+        if self.verbose:
+            for program, _, opened in batch:
+                print(f"  Launching: {program}")
+                print(f"    {opened}")
 
     def _launch_program(self, program: str) -> None:
         """Launch a single program.
@@ -85,10 +308,10 @@ class ProgramLauncher:
             print(f"  Launching: {program}")
 
         # Detect if it's a URL (chrome tab)
-        if program.lower().startswith(('http://', 'https://', 'www.')):
+        if _URL_RE.match(program):
             self._open_url(program)
         # Check if it contains "chrome tab with" or "chrome" in the description
-        elif "chrome" in program.lower() and ("tab" in program.lower() or "with" in program.lower()):
+        elif _CHROME_RE.match(program):
             # Extract URL or search term from the description
             url = self._extract_url_from_description(program)
             self._open_url(url)
@@ -105,38 +328,32 @@ class ProgramLauncher:
         Returns:
             URL to open
         """
-        # Simple extraction - look for common patterns
-        description_lower = description.lower()
-        
-        # Common search/site patterns
-        if "speed check" in description_lower or "speed test" in description_lower:
-            return "https://www.speedtest.net"
-        elif "github" in description_lower:
-            return "https://github.com"
-        elif "google" in description_lower:
-            return "https://www.google.com"
+        # Simple extraction - look for common search/site patterns
+        match = _SITE_RE.match(description)
+        if match:
+            return _SITE_URLS[match.lastgroup]
         else:
             # Default to searching Google for the description
             search_term = description.replace("chrome tab with", "").replace("chrome", "").strip()
             return f"https://www.google.com/search?q={search_term.replace(' ', '+')}"
 
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """Add the https:// scheme to URLs that don't have one."""
+        if not url.startswith(('http://', 'https://')):
+            url = 'https://' + url.lstrip('www.')
+        return url
+
     def _open_url(self, url: str) -> None:
         """Open a URL in the default browser.
         
         Args:
             url: URL to open
         """
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url.lstrip('www.')
+        url = self._normalize_url(url)
 
         try:
-            if platform.system() == "Darwin":  # macOS
-                subprocess.Popen(["open", url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            elif platform.system() == "Windows":
-                subprocess.Popen(["start", url], shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            else:  # Linux and others
-                subprocess.Popen(["xdg-open", url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
+            _spawn(_url_argv(url), shell=_USE_SHELL)
             if self.verbose:
                 print(f"    Opened URL: {url}")
         except Exception as e:
@@ -148,70 +365,20 @@ class ProgramLauncher:
         Args:
             app_name: Name of the application to open
         """
-        # Normalize common application names
-        app_map = {
-            "vscode": ["code", "Code", "Visual Studio Code"],
-            "vs code": ["code", "Code", "Visual Studio Code"],
-            "league": ["LeagueClient", "League of Legends"],
-            "professor": ["professor.gg", "Professor"],
-            "chrome": ["google-chrome", "chrome", "Google Chrome"],
-            "firefox": ["firefox", "Firefox"],
-            "spotify": ["spotify", "Spotify"],
-            "discord": ["discord", "Discord"],
-            "slack": ["slack", "Slack"],
-        }
-
-        # Get possible names for this app
-        app_lower = app_name.lower()
-        possible_names = app_map.get(app_lower, [app_name])
-
-        system = platform.system()
-        launched = False
-
-        for name in possible_names:
+        argv = _app_argv(app_name)
+        if argv is not None:
             try:
-                if system == "Darwin":  # macOS
-                    # Try to open as an application
-                    subprocess.Popen(["open", "-a", name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    launched = True
-                    if self.verbose:
-                        print(f"    Opened application: {name}")
-                    break
-                elif system == "Windows":
-                    # Try to start the application
-                    subprocess.Popen(["start", name], shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    launched = True
-                    if self.verbose:
-                        print(f"    Opened application: {name}")
-                    break
-                else:  # Linux
-                    # Try multiple methods for Linux
-                    try:
-                        subprocess.Popen([name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                        launched = True
-                        if self.verbose:
-                            print(f"    Opened application: {name}")
-                        break
-                    except FileNotFoundError:
-                        # Try with common snap/flatpak prefixes
-                        for prefix in ["", "/snap/bin/", "/usr/bin/", "/usr/local/bin/"]:
-                            try:
-                                subprocess.Popen([prefix + name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                launched = True
-                                if self.verbose:
-                                    print(f"    Opened application: {prefix + name}")
-                                break
-                            except (FileNotFoundError, PermissionError):
-                                continue
-                        if launched:
-                            break
+                _spawn(argv, shell=_USE_SHELL)
+                if self.verbose:
+                    print(f"    Opened application: {argv[-1]}")
+                return
             except Exception:
-                continue
+                pass  # Reported below like an application that wasn't found
 
-        if not launched:
-            print(f"    Warning: Could not launch application '{app_name}'")
-            if self.verbose:
-                print(f"      Tried: {', '.join(possible_names)}")
+        print(f"    Warning: Could not launch application '{app_name}'")
+        if self.verbose:
+            possible_names = _APP_MAP.get(app_name.lower()) or (app_name,)
+            print(f"      Tried: {', '.join(possible_names)}")
 
 
 def main():
@@ -11,22 +11,33 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import launcher
 
 
+SAMPLE_CONFIG = {
+    "groups": {
+        "test_group": ["app1", "app2"],
+        "url_group": ["https://example.com", "www.google.com"],
+        "mixed_group": ["vscode", "https://github.com", "chrome tab with speed check"]
+    }
+}
+
+
 @pytest.fixture
 def temp_config(tmp_path):
     """Create a temporary configuration file."""
-    config = {
-        "groups": {
-            "test_group": ["app1", "app2"],
-            "url_group": ["https://example.com", "www.google.com"],
-            "mixed_group": ["vscode", "https://github.com", "chrome tab with speed check"]
-        }
-    }
     config_file = tmp_path / "test_groups.json"
     with open(config_file, 'w') as f:
-        json.dump(config, f)
+        json.dump(SAMPLE_CONFIG, f)
     return config_file
 
 
+@pytest.fixture(scope="module")
+def launcher_obj(tmp_path_factory):
+    """Create a launcher shared by the tests that don't change its configuration."""
+    config_file = tmp_path_factory.mktemp("config") / "test_groups.json"
+    with open(config_file, 'w') as f:
+        json.dump(SAMPLE_CONFIG, f)
+    return launcher.ProgramLauncher(config_file)
+
+
 @pytest.fixture
 def invalid_config(tmp_path):
     """Create an invalid configuration file."""
@@ -55,11 +66,29 @@ class TestProgramLauncher:
         assert launcher_obj.config is not None
         assert "groups" in launcher_obj.config
 
+    def test_init_reuses_parsed_config(self, temp_config):
+        """Test that an unchanged config file is only parsed once."""
+        first = launcher.ProgramLauncher(temp_config)
+        with patch('launcher._json_loads') as mock_load:
+            second = launcher.ProgramLauncher(temp_config)
+        mock_load.assert_not_called()
+        assert second.config == first.config
+
+    def test_init_config_not_shared(self, temp_config):
+        """Test that changing one launcher's config doesn't affect another's."""
+        first = launcher.ProgramLauncher(temp_config)
+        first.config["groups"]["test_group"] = ["app3"]
+        first.config["other"] = True
+        second = launcher.ProgramLauncher(temp_config)
+        assert second.config["groups"]["test_group"] == ("app1", "app2")
+        assert "other" not in second.config
+
     def test_init_missing_file(self, tmp_path):
         """Test initialization with missing config file."""
         missing_file = tmp_path / "nonexistent.json"
-        with pytest.raises(FileNotFoundError):
+        with pytest.raises(FileNotFoundError, match="Configuration file not found") as excinfo:
             launcher.ProgramLauncher(missing_file)
+        assert excinfo.value.__suppress_context__
 
     def test_init_invalid_json(self, invalid_config):
         """Test initialization with invalid JSON."""
@@ -71,117 +100,218 @@ class TestProgramLauncher:
         with pytest.raises(ValueError, match="must contain a 'groups' key"):
             launcher.ProgramLauncher(missing_groups_config)
 
-    def test_list_groups(self, temp_config):
+    def test_launch_group_not_a_list(self, tmp_path):
+        """Test that a group that isn't a list of programs is rejected."""
+        config_file = tmp_path / "bad_group.json"
+        config_file.write_text(json.dumps({"groups": {"bad": "app1"}}))
+        with pytest.raises(ValueError, match="must contain a list of programs"):
+            launcher.ProgramLauncher(config_file).launch_group("bad")
+
+    def test_list_groups(self, launcher_obj):
         """Test listing available groups."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         groups = launcher_obj.list_groups()
         assert "test_group" in groups
         assert "url_group" in groups
         assert "mixed_group" in groups
 
-    def test_launch_invalid_group(self, temp_config):
+    def test_launch_invalid_group(self, launcher_obj):
         """Test launching a non-existent group."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         with pytest.raises(ValueError, match="Group 'invalid' not found"):
             launcher_obj.launch_group("invalid")
 
+    @patch('launcher._spawn')
+    @patch('launcher.ProgramLauncher._batch_command', return_value=None)
     @patch('launcher.ProgramLauncher._launch_program')
-    def test_launch_group_success(self, mock_launch, temp_config):
+    def test_launch_group_success(self, mock_launch, mock_batch, mock_spawn, launcher_obj):
         """Test launching a valid group."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj.launch_group("test_group")
-        assert mock_launch.call_count == 2
-        mock_launch.assert_any_call("app1")
-        mock_launch.assert_any_call("app2")
+        assert [call[0][0] for call in mock_launch.call_args_list] == ["app1", "app2"]
+        mock_spawn.assert_not_called()
+
+    @patch('launcher._spawn')
+    @patch('launcher.ProgramLauncher._batch_command',
+           side_effect=lambda program: (["/opt/bin/" + program], f"Opened application: {program}"))
+    @patch('launcher.ProgramLauncher._launch_program')
+    def test_launch_group_batches_commands(self, mock_launch, mock_batch, mock_spawn, launcher_obj):
+        """Test that programs with known commands are started with one process."""
+        launcher_obj.launch_group("test_group")
+        mock_launch.assert_not_called()
+        mock_spawn.assert_called_once_with(["/bin/sh", "-c", "/opt/bin/app1 & /opt/bin/app2 &"])
 
-    def test_extract_url_speed_check(self, temp_config):
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('launcher._URL_OPENER_FOUND', True)
+    @patch('subprocess.Popen')
+    def test_launch_group_batches_urls(self, mock_popen, launcher_obj):
+        """Test that a group of URLs is started with a single process."""
+        launcher_obj.launch_group("url_group")
+        mock_popen.assert_called_once()
+        args = mock_popen.call_args[0][0]
+        assert args[:2] == ["/bin/sh", "-c"]
+        assert "xdg-open https://example.com &" in args[2]
+        assert "xdg-open https://google.com &" in args[2]
+
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('launcher._URL_OPENER_FOUND', True)
+    @patch('subprocess.Popen')
+    def test_launch_group_batch_verbose(self, mock_popen, temp_config, capfd):
+        """Test that batched programs are reported in verbose mode."""
+        launcher_obj = launcher.ProgramLauncher(temp_config, verbose=True)
+        launcher_obj.launch_group("url_group")
+        out = capfd.readouterr().out
+        assert "  Launching: https://example.com\n    Opened URL: https://example.com\n" in out
+        assert "  Launching: www.google.com\n    Opened URL: https://google.com\n" in out
+
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('launcher._URL_OPENER_FOUND', True)
+    @patch('subprocess.Popen', side_effect=[OSError("No /bin/sh"), MagicMock(), OSError("No xdg-open")])
+    def test_launch_group_batch_failure(self, mock_popen, launcher_obj, capfd):
+        """Test that a batch that can't be started falls back to per-program launches."""
+        launcher_obj.launch_group("url_group")
+        assert mock_popen.call_count == 3
+        assert mock_popen.call_args_list[1][0][0] == ["xdg-open", "https://example.com"]
+        out = capfd.readouterr().out
+        assert "Failed to open URL 'https://google.com'" in out
+        assert "example.com" not in out.split("Launching group")[1]
+
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('launcher._URL_OPENER_FOUND', True)
+    @patch('shutil.which', return_value=None)
+    @patch('subprocess.Popen', side_effect=lambda args, **kwargs: print(f"spawned {args[-1]}"))
+    def test_launch_group_keeps_order(self, mock_popen, mock_which, tmp_path, capfd):
+        """Test that programs start in the order the group lists them."""
+        config_file = tmp_path / "order.json"
+        config_file.write_text(json.dumps(
+            {"groups": {"order": ["https://github.com", "missingapp", "www.google.com"]}}
+        ))
+        launcher.ProgramLauncher(config_file).launch_group("order")
+        out = capfd.readouterr().out
+        assert out.index("spawned https://github.com") < out.index("'missingapp'")
+        assert out.index("'missingapp'") < out.index("spawned https://google.com")
+
+    def test_extract_url_speed_check(self, launcher_obj):
         """Test URL extraction for speed check."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         url = launcher_obj._extract_url_from_description("chrome tab with a speed check")
         assert "speedtest.net" in url
 
-    def test_extract_url_github(self, temp_config):
+    def test_extract_url_github(self, launcher_obj):
         """Test URL extraction for github."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         url = launcher_obj._extract_url_from_description("chrome tab with github open")
         assert "github.com" in url
 
-    def test_extract_url_google(self, temp_config):
+    def test_extract_url_google(self, launcher_obj):
         """Test URL extraction for google."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         url = launcher_obj._extract_url_from_description("chrome tab with google")
         assert "google.com" in url
 
-    def test_extract_url_generic(self, temp_config):
+    def test_extract_url_priority(self, launcher_obj):
+        """Test that speed check wins over other sites in the same description."""
+        url = launcher_obj._extract_url_from_description("Chrome tab with a Google speed test")
+        assert "speedtest.net" in url
+
+    def test_extract_url_generic(self, launcher_obj):
         """Test URL extraction for generic search."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         url = launcher_obj._extract_url_from_description("chrome tab with something random")
         assert "google.com/search" in url
         assert "something+random" in url
 
     @patch('subprocess.Popen')
-    def test_open_url(self, mock_popen, temp_config):
+    def test_open_url(self, mock_popen, launcher_obj):
         """Test opening a URL."""
-        launcher_obj = launcher.ProgramLauncher(temp_config, verbose=True)
         launcher_obj._open_url("https://example.com")
         assert mock_popen.called
 
     @patch('subprocess.Popen')
-    def test_open_url_without_protocol(self, mock_popen, temp_config):
+    def test_open_url_without_protocol(self, mock_popen, launcher_obj):
         """Test opening a URL without http protocol."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._open_url("www.example.com")
         # Check that Popen was called with the normalized URL (https:// is added)
         assert mock_popen.called
         call_args = str(mock_popen.call_args)
         assert "https://example.com" in call_args or "example.com" in call_args
 
+    @patch('shutil.which', side_effect=lambda name: "/usr/bin/" + name)
     @patch('subprocess.Popen')
-    def test_open_application(self, mock_popen, temp_config):
+    def test_open_application(self, mock_popen, mock_which, launcher_obj):
         """Test opening an application."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._open_application("vscode")
         assert mock_popen.called
 
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch.dict('launcher._APP_DISPATCH', {"vscode": ["/usr/bin/code"]})
+    @patch('subprocess.Popen')
+    def test_open_application_resolved(self, mock_popen, launcher_obj):
+        """Test opening an application through its resolved executable."""
+        launcher_obj._open_application("VSCode")
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args[0][0] == ["/usr/bin/code"]
+
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('shutil.which', side_effect=lambda name: name if name.startswith("/snap/bin/") else None)
+    @patch('subprocess.Popen')
+    def test_open_application_prefix_fallback(self, mock_popen, mock_which, launcher_obj):
+        """Test that an application missing from PATH is looked for under common prefixes."""
+        launcher_obj._open_application("someapp")
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args[0][0] == ["/snap/bin/someapp"]
+
+    @pytest.mark.skipif(launcher._SYSTEM in ("Darwin", "Windows"), reason="Linux launch path")
+    @patch('shutil.which', return_value=None)
+    @patch('subprocess.Popen')
+    def test_open_application_not_installed(self, mock_popen, mock_which, launcher_obj, capfd):
+        """Test that a missing application is reported without trying to start it."""
+        launcher_obj._open_application("someapp")
+        assert not mock_popen.called
+        assert "Could not launch application 'someapp'" in capfd.readouterr().out
+
+    @patch('launcher._URL_OPENER_FOUND', True)
+    @patch.dict('launcher._APP_DISPATCH', {"vscode": ["/usr/bin/code"]})
+    @patch('subprocess.Popen')
+    def test_batch_command_matches_direct_launch(self, mock_popen, launcher_obj):
+        """Test that batched and single launches build the same commands."""
+        launcher_obj._open_application("vscode")
+        launcher_obj._open_url("www.example.com")
+        direct = [call[0][0] for call in mock_popen.call_args_list]
+        if launcher._USE_SHELL:
+            assert launcher_obj._batch_command("vscode") is None
+        else:
+            assert direct == [
+                launcher_obj._batch_command("vscode")[0],
+                launcher_obj._batch_command("www.example.com")[0],
+            ]
+
     @patch('subprocess.Popen', side_effect=Exception("Launch failed"))
-    def test_open_url_failure(self, mock_popen, temp_config, capsys):
+    def test_open_url_failure(self, mock_popen, launcher_obj, capfd):
         """Test handling of URL opening failure."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._open_url("https://example.com")
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         assert "Warning" in captured.out or "Failed" in captured.out
 
     @patch('launcher.ProgramLauncher._open_url')
-    def test_launch_program_url_http(self, mock_open_url, temp_config):
+    def test_launch_program_url_http(self, mock_open_url, launcher_obj):
         """Test launching a program with HTTP URL."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._launch_program("https://example.com")
         mock_open_url.assert_called_once()
 
     @patch('launcher.ProgramLauncher._open_url')
-    def test_launch_program_url_www(self, mock_open_url, temp_config):
+    def test_launch_program_url_www(self, mock_open_url, launcher_obj):
         """Test launching a program with www URL."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._launch_program("www.example.com")
         mock_open_url.assert_called_once()
 
     @patch('launcher.ProgramLauncher._open_url')
-    def test_launch_program_chrome_tab(self, mock_open_url, temp_config):
+    def test_launch_program_chrome_tab(self, mock_open_url, launcher_obj):
         """Test launching a chrome tab description."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._launch_program("chrome tab with github")
         mock_open_url.assert_called_once()
 
     @patch('launcher.ProgramLauncher._open_application')
-    def test_launch_program_application(self, mock_open_app, temp_config):
+    def test_launch_program_application(self, mock_open_app, launcher_obj):
         """Test launching an application."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         launcher_obj._launch_program("vscode")
         mock_open_app.assert_called_once()
 
-    def test_launch_program_empty_string(self, temp_config):
+    def test_launch_program_empty_string(self, launcher_obj):
         """Test launching with empty program string."""
-        launcher_obj = launcher.ProgramLauncher(temp_config)
         # Should not raise an error, just skip
         launcher_obj._launch_program("")
         launcher_obj._launch_program("   ")
@@ -191,7 +321,7 @@ class TestMain:
     """Test cases for main function."""
 
     @patch('launcher.ProgramLauncher')
-    def test_main_list_groups(self, mock_launcher_class, temp_config, capsys):
+    def test_main_list_groups(self, mock_launcher_class, temp_config, capfd):
         """Test main function with --list flag."""
         mock_instance = MagicMock()
         mock_instance.list_groups.return_value = ["group1", "group2"]
@@ -201,11 +331,11 @@ class TestMain:
         with patch('sys.argv', ['launcher.py', '--list', '--config', str(temp_config)]):
             launcher.main()
         
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         assert "Available groups" in captured.out
 
     @patch('launcher.ProgramLauncher')
-    def test_main_no_args(self, mock_launcher_class, temp_config, capsys):
+    def test_main_no_args(self, mock_launcher_class, temp_config, capfd):
         """Test main function with no group specified."""
         mock_instance = MagicMock()
         mock_instance.list_groups.return_value = ["group1"]
@@ -215,7 +345,7 @@ class TestMain:
         with patch('sys.argv', ['launcher.py', '--config', str(temp_config)]):
             launcher.main()
         
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         assert "Available groups" in captured.out
 
     @patch('launcher.ProgramLauncher')
@@ -230,11 +360,11 @@ class TestMain:
         mock_instance.launch_group.assert_called_once_with('test_group')
 
     @patch('launcher.ProgramLauncher', side_effect=Exception("Test error"))
-    def test_main_error_handling(self, mock_launcher_class, temp_config, capsys):
+    def test_main_error_handling(self, mock_launcher_class, temp_config, capfd):
         """Test main function error handling."""
         with patch('sys.argv', ['launcher.py', 'test_group', '--config', str(temp_config)]):
             with pytest.raises(SystemExit):
                 launcher.main()
         
-        captured = capsys.readouterr()
+        captured = capfd.readouterr()
         assert "Error" in captured.out